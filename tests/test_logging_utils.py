@@ -0,0 +1,55 @@
+"""
+Pruebas del registro en los procesos trabajadores de la generación masiva.
+"""
+
+import os
+import sys
+import time
+import logging
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vgQRGen.utils.logging_utils import LogManager
+from vgQRGen.utils.path_utils import resource_path
+from vgQRGen.core.qr_manager import init_worker
+
+
+def _worker_log_state(_):
+    """Estado del registro dentro del proceso trabajador (inicializado, manejadores raíz)."""
+    return LogManager._initialized, [type(h).__name__ for h in logging.getLogger().handlers]
+
+
+class TestWorkerLogging(unittest.TestCase):
+    """El registro de los procesos trabajadores no crea archivos propios."""
+
+    def _log_files(self):
+        log_dir = resource_path("logs")
+        if not os.path.isdir(log_dir):
+            return set()
+        return set(os.listdir(log_dir))
+
+    def test_spawn_pool_creates_no_log_files(self):
+        # Registro del proceso principal ya inicializado, como en la aplicación
+        LogManager.get_logger()
+        before = self._log_files()
+        # Los nombres de archivo tienen resolución de segundos: un archivo creado por un
+        # trabajador en el mismo segundo coincidiría con el del proceso principal
+        time.sleep(1.1)
+
+        output_dir = resource_path("codes")
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=2, mp_context=context,
+                                 initializer=init_worker, initargs=(output_dir,)) as executor:
+            states = list(executor.map(_worker_log_state, range(2)))
+
+        self.assertEqual(self._log_files(), before)
+        for initialized, handlers in states:
+            self.assertFalse(initialized)
+            self.assertEqual(handlers, ['StreamHandler'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,8 +7,6 @@ que contienen información de redes WiFi.
 
 import os
 import logging
-import openpyxl
-from openpyxl.utils.exceptions import InvalidFileException
 from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass
 from .qr_manager import WiFiCredentials
@@ -17,6 +15,14 @@ from ..utils.path_utils import resource_path
 
 logger = LogManager.get_logger(__name__)
 
+# Lector opcional en Rust, mucho más rápido que openpyxl para libros grandes
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+DEFAULT_ENGINE = "calamine" if python_calamine is not None else "openpyxl"
+
 @dataclass
 class ExcelColumns:
     """Clase de datos para almacenar índices de columnas de Excel."""
@@ -26,6 +32,52 @@ class ExcelColumns:
     encryption: Optional[int] = None
     property_type: Optional[int] = None
 
+class _CalamineSheet:
+    """Adaptador de una hoja de python-calamine con la interfaz de openpyxl usada aquí."""
+    
+    def __init__(self, sheet):
+        # skip_empty_area=False conserva las filas y columnas vacías iniciales,
+        # para que los índices coincidan con los de openpyxl
+        self._rows = sheet.to_python(skip_empty_area=False)
+        self.max_row = len(self._rows)
+        self.max_column = max((len(row) for row in self._rows), default=0)
+        
+    @staticmethod
+    def _value(value):
+        # calamine devuelve "" en celdas vacías y float en todos los números
+        if value == "":
+            return None
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+        
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None,
+                  max_col: Optional[int] = None, values_only: bool = True):
+        """Recorrer filas como tuplas de valores (filas y columnas base 1, como openpyxl)."""
+        for row in self._rows[min_row - 1:max_row]:
+            values = tuple(self._value(v) for v in row[:max_col])
+            if max_col is not None and len(values) < max_col:
+                values += (None,) * (max_col - len(values))
+            yield values
+
+
+class _CalamineWorkbook:
+    """Adaptador de un libro de python-calamine con la interfaz de openpyxl usada aquí."""
+    
+    def __init__(self, file_path: str):
+        self._workbook = python_calamine.CalamineWorkbook.from_path(file_path)
+        self.sheetnames = list(self._workbook.sheet_names)
+        
+    def __getitem__(self, sheet_name: str) -> _CalamineSheet:
+        return _CalamineSheet(self._workbook.get_sheet_by_name(sheet_name))
+        
+    def close(self):
+        # Solo las versiones recientes de python-calamine exponen close()
+        close = getattr(self._workbook, "close", None)
+        if close:
+            close()
+
+
 class ExcelManager:
     """Gestiona operaciones de archivo Excel y extracción de datos."""
     
@@ -38,15 +90,26 @@ class ExcelManager:
         'property': ['property', 'propiedad', 'hotel', 'region', 'zona', 'lugar', 'site']
     }
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, read_only: bool = True, data_only: bool = True,
+                 engine: Optional[str] = None):
         """
         Inicializar Gestor de Excel.
         
         Args:
             file_path (str): Ruta al archivo Excel
+            read_only (bool): Leer el libro en modo streaming (sin árbol de celdas en memoria)
+            data_only (bool): Leer los valores calculados en lugar de las fórmulas
+            engine (Optional[str]): "calamine" u "openpyxl"; por defecto calamine si está instalado
         """        
         self.file_path = file_path
+        self.engine = engine or DEFAULT_ENGINE
+        if self.engine == "calamine" and python_calamine is None:
+            logger.warning("python-calamine no está instalado; se usará openpyxl")
+            self.engine = "openpyxl"
+        self.read_only = read_only
+        self.data_only = data_only
         self.workbook = None
+        self.loaded_mtime = None  # Fecha de modificación del archivo al cargarlo
         self.sheet = None
         self.columns = None
         self.columns_detected = False  # Indicador si las columnas fueron detectadas (automática o manualmente)
@@ -72,8 +135,9 @@ class ExcelManager:
             logger.error(f"Extensión de archivo inválida: {self.file_path}. Debe ser .xlsx o .xls")
             return False, "El archivo debe ser un archivo Excel (.xlsx o .xls)"
         
-        file_size = os.path.getsize(self.file_path)
-        logger.debug(f"Tamaño del archivo: {file_size} bytes")
+        file_stat = os.stat(self.file_path)
+        self.loaded_mtime = file_stat.st_mtime
+        logger.debug(f"Tamaño del archivo: {file_stat.st_size} bytes")
             
         try:
             # Intentar abrir el archivo para verificar que no está corrupto
@@ -104,9 +168,20 @@ class ExcelManager:
             return False, error_msg
         
         logger.info(f"Iniciando carga del libro Excel: {self.file_path}")
+        
+        if self.engine == "calamine":
+            return self._load_workbook_calamine()
+            
+        # Importación diferida: openpyxl es pesado y solo se necesita al abrir un libro,
+        # lo que ocurre en un hilo secundario y no durante el arranque de la interfaz
+        import openpyxl
+        from openpyxl.utils.exceptions import InvalidFileException
+        
         try:
-            logger.debug(f"Abriendo archivo Excel con opción data_only=True")
-            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
+            logger.debug(f"Abriendo archivo Excel con opciones read_only={self.read_only}, data_only={self.data_only}")
+            # keep_links=False: el libro nunca se guarda, así que no se leen los vínculos externos
+            self.workbook = openpyxl.load_workbook(self.file_path, read_only=self.read_only,
+                                                   data_only=self.data_only, keep_links=False)
             
             # Registro de información sobre el libro
             sheet_count = len(self.workbook.sheetnames)
@@ -132,6 +207,57 @@ class ExcelManager:
             logger.error(f"{error_msg}. Excepción: {type(e).__name__}. Detalles: {str(e)}")
             return False, error_msg
     
+    def _load_workbook_calamine(self) -> Tuple[bool, str]:
+        """
+        Cargar el libro con python-calamine.
+        
+        Returns:
+            Tuple[bool, str]: (éxito, mensaje_error)
+        """
+        try:
+            logger.debug("Abriendo archivo Excel con python-calamine")
+            self.workbook = _CalamineWorkbook(self.file_path)
+            
+            sheet_count = len(self.workbook.sheetnames)
+            logger.info(f"Libro Excel cargado exitosamente: {self.file_path}")
+            logger.info(f"El libro contiene {sheet_count} hoja(s): {', '.join(self.workbook.sheetnames)}")
+            
+            if not self.workbook.sheetnames:
+                logger.error("El archivo Excel no contiene hojas")
+                return False, "El archivo Excel no contiene hojas"
+                
+            return True, ""
+            
+        except PermissionError:
+            error_msg = "Error de permisos al acceder al archivo"
+            logger.error(f"{error_msg}. Verifique que el archivo {self.file_path} no esté abierto en otro programa.")
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Error al cargar el libro: {str(e)}"
+            logger.error(f"{error_msg}. Excepción: {type(e).__name__}. Detalles: {str(e)}")
+            return False, error_msg
+    
+    def is_current(self) -> bool:
+        """
+        Indicar si el libro ya está cargado y el archivo no cambió desde entonces.
+        
+        Returns:
+            bool: True si se puede reutilizar el libro cargado sin volver a leerlo
+        """
+        if not self.workbook or self.loaded_mtime is None:
+            return False
+        try:
+            return os.path.getmtime(self.file_path) == self.loaded_mtime
+        except OSError:
+            return False
+            
+    def close(self):
+        """Cerrar el libro; en modo read_only mantiene abierto el archivo hasta cerrarlo."""
+        if self.workbook and (self.read_only or self.engine == "calamine"):
+            self.workbook.close()
+        self.workbook = None
+        self.sheet = None
+        
     def get_sheet_names(self) -> List[str]:
         """
         Obtener lista de nombres de hojas disponibles.
@@ -166,12 +292,15 @@ class ExcelManager:
         logger.debug(f"Seleccionando hoja: '{sheet_name}'")
         self.sheet = self.workbook[sheet_name]
         
-        # Verificar si la hoja está vacía
+        # Verificar si la hoja está vacía. En modo read_only las dimensiones salen de la
+        # etiqueta <dimension> del archivo y pueden faltar (None), así que se comprueba
+        # directamente si existe una segunda fila
         max_row = self.sheet.max_row
         max_col = self.sheet.max_column
         logger.debug(f"La hoja '{sheet_name}' tiene {max_row} filas y {max_col} columnas")
         
-        if max_row < 2:  # Necesita al menos fila de encabezado y una fila de datos
+        # Necesita al menos fila de encabezado y una fila de datos
+        if next(self.sheet.iter_rows(min_row=2, max_row=2, values_only=True), None) is None:
             logger.warning(f"La hoja '{sheet_name}' está vacía o solo contiene encabezados (filas: {max_row})")
             return False, "La hoja seleccionada parece estar vacía o solo contiene encabezados"
             
@@ -222,14 +351,14 @@ class ExcelManager:
         }
         
         # Obtener fila de encabezado (primera fila)
-        header_row = list(self.sheet.iter_rows(min_row=1, max_row=1))[0]
+        header_row = next(self.sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
         
         # Buscar en fila de encabezado nombres de columnas
-        for idx, cell in enumerate(header_row):
-            if not cell.value:
+        for idx, value in enumerate(header_row):
+            if not value:
                 continue
                 
-            cell_value = str(cell.value).lower().strip()
+            cell_value = str(value).lower().strip()
             
             # Verificar coincidencias exactas primero
             for col_type, keywords in self.COLUMN_KEYWORDS.items():
@@ -268,6 +397,16 @@ class ExcelManager:
             property_type=column_indices.get('property')
         )
 
+    def _iter_data_rows(self):
+        """
+        Recorrer las filas de datos como tuplas de valores.
+        
+        Se limita a las columnas configuradas y se fija max_col para que todas las
+        filas tengan la misma longitud aunque el archivo omita celdas vacías.
+        """
+        max_col = max(idx for idx in vars(self.columns).values() if idx is not None) + 1
+        return self.sheet.iter_rows(min_row=2, max_col=max_col, values_only=True)
+        
     def get_room_data(self, room_number: str) -> Optional[WiFiCredentials]:
         """
         Obtener credenciales WiFi para una habitación específica.
@@ -285,7 +424,7 @@ class ExcelManager:
         room_number = str(room_number).strip().upper()
         logger.info(f"Buscando habitación: {room_number}")
         
-        for row in self.sheet.iter_rows(min_row=2, values_only=True):
+        for row in self._iter_data_rows():
             if str(row[self.columns.room]).strip().upper() == room_number:
                 logger.info(f"Habitación {room_number} encontrada")
                 
@@ -308,16 +447,26 @@ class ExcelManager:
                     ssid=ssid,
                     password=password,
                     encryption=encryption,  # Puede ser None
-                    property_type=property_type
+                    property_type=property_type,
+                    room=str(row[self.columns.room]).strip()
                 )
         
         logger.warning(f"Habitación {room_number} no encontrada en la hoja activa")
         return None
         
-    def get_all_rooms(self) -> List[WiFiCredentials]:
+    def get_all_rooms(self, default_encryption: Optional[str] = None, default_property_type: Optional[str] = None,
+                      use_sheet_encryption: bool = True, use_sheet_property: bool = True) -> List[WiFiCredentials]:
         """
         Obtener credenciales WiFi para todas las habitaciones en la hoja.
         
+        Los valores por defecto se aplican al leer cada fila, sin una segunda pasada.
+        
+        Args:
+            default_encryption (Optional[str]): Encriptación cuando la hoja no la indica o no se usa
+            default_property_type (Optional[str]): Propiedad cuando la hoja no la indica o no se usa
+            use_sheet_encryption (bool): Tomar la encriptación de la hoja si hay columna y valor
+            use_sheet_property (bool): Tomar la propiedad de la hoja si hay columna y valor
+            
         Returns:
             List[WiFiCredentials]: Lista de todas las credenciales de habitaciones
         """
@@ -329,7 +478,11 @@ class ExcelManager:
         credentials = []
         row_count = 0
         
-        for row in self.sheet.iter_rows(min_row=2, values_only=True):
+        # Columnas opcionales que realmente se leen (None si no existen o no se usan)
+        encryption_col = self.columns.encryption if use_sheet_encryption else None
+        property_col = self.columns.property_type if use_sheet_property else None
+        
+        for row in self._iter_data_rows():
             row_count += 1
             if not row[self.columns.room] or not row[self.columns.ssid]:
                 logger.debug(f"Ignorando fila {row_count+1} por valores de habitación o SSID vacíos")
@@ -338,13 +491,13 @@ class ExcelManager:
             room = str(row[self.columns.room]).strip()
             ssid = str(row[self.columns.ssid]).strip()
             
-            # Si hay columna de encryption y tiene valor, usarlo; si no, devolver None
-            encryption = None
-            if self.columns.encryption is not None and row[self.columns.encryption]:
-                encryption = str(row[self.columns.encryption]).strip()
+            # Si hay columna de encryption y tiene valor, usarlo; si no, el valor por defecto
+            encryption = default_encryption
+            if encryption_col is not None and row[encryption_col]:
+                encryption = str(row[encryption_col]).strip()
                 
             password = str(row[self.columns.password]).strip() if self.columns.password is not None and row[self.columns.password] else None
-            property_type = str(row[self.columns.property_type]).strip() if self.columns.property_type is not None and row[self.columns.property_type] else None
+            property_type = str(row[property_col]).strip() if property_col is not None and row[property_col] else default_property_type
             
             logger.debug(f"Encontrada habitación {room} - SSID: {ssid}, Encriptación: {encryption}, Propiedad: {property_type}")
                 
@@ -352,7 +505,8 @@ class ExcelManager:
                 ssid=ssid,
                 password=password,
                 encryption=encryption,  # Puede ser None
-                property_type=property_type
+                property_type=property_type,
+                room=room
             )
             credentials.append(cred)
             
@@ -6,9 +6,10 @@ para credenciales de redes WiFi.
 """
 
 import os
-from io import BytesIO
+import sys
+import logging
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Dict, Tuple
 from PIL import Image, ImageDraw, ImageFont
 import segno
 from segno import helpers
@@ -17,13 +18,27 @@ from ..utils.path_utils import resource_path
 
 logger = LogManager.get_logger(__name__)
 
-@dataclass
+# Gestor propio de cada proceso trabajador en la generación masiva (logos decodificados una vez)
+_worker_manager: Optional["QRManager"] = None
+
+# Tabla para bytes.translate: módulo claro (0) -> blanco (255), oscuro -> negro (0)
+_MODULE_TO_GRAY = bytes([255]) + bytes(255)
+
+# Nivel zlib para la generación masiva: bastante más rápido que 6 a cambio de archivos
+# algo mayores (el modo manual conserva el nivel por defecto)
+BATCH_COMPRESS_LEVEL = 1
+
+# __slots__ en dataclasses requiere Python 3.10+; en versiones anteriores se usa __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class WiFiCredentials:
-    """Clase de datos para almacenar credenciales de red WiFi."""
+    """Clase de datos para almacenar credenciales de red WiFi (sin __dict__ por instancia)."""
     ssid: str
     password: Optional[str] = None
     encryption: str = "WPA2" # Valor por defecto. 
     property_type: Optional[str] = None
+    room: Optional[str] = None  # Habitación de origen cuando provienen de Excel
 
 class QRManager:
     """Gestiona la generación y manipulación de códigos QR."""
@@ -43,7 +58,85 @@ class QRManager:
         self.output_dir = resource_path(output_dir)
         os.makedirs(self.output_dir, exist_ok=True)
         
-    def generate_wifi_qr(self, credentials: WiFiCredentials) -> BytesIO:
+        # Registro de logos decodificados (imagen RGBA, máscara alfa) por tipo de propiedad
+        self._logos: Dict[str, Tuple[Image.Image, Image.Image]] = {}
+        # Logos ya redimensionados por (tipo de propiedad, tamaño)
+        self._resized_logos: Dict[Tuple[str, int], Tuple[Image.Image, Image.Image]] = {}
+        # Logo, máscara y posición centrada por (tamaño del QR, tipo de propiedad)
+        self._logo_placements: Dict[Tuple[Tuple[int, int], str], Tuple[Image.Image, Image.Image, Tuple[int, int]]] = {}
+        self._load_logos()
+        
+    def _load_logos(self):
+        """Leer y decodificar una sola vez los logotipos de LOGO_PATHS."""
+        for property_type, logo_path in self.LOGO_PATHS.items():
+            if not os.path.exists(logo_path):
+                logger.error(f"Archivo de logo no encontrado: {logo_path}")
+                continue
+            try:
+                with Image.open(logo_path) as img:
+                    logo_img = img.convert('RGBA')
+                self._logos[property_type] = (logo_img, logo_img.split()[3])
+                logger.debug(f"Logo cargado para propiedad {property_type}: {logo_path}")
+            except Exception as e:
+                logger.error(f"Error cargando logo {logo_path}: {str(e)}")
+                
+    def _get_logo(self, property_type: str, logo_size: int) -> Optional[Tuple[Image.Image, Image.Image]]:
+        """
+        Obtener el logo redimensionado y su máscara, memorizando el resultado por tamaño.
+        
+        Args:
+            property_type (str): Tipo de propiedad normalizado
+            logo_size (int): Tamaño máximo del lado del logo en píxeles
+            
+        Returns:
+            Optional[Tuple[Image.Image, Image.Image]]: (logo RGBA, máscara alfa) o None si no hay logo
+        """
+        key = (property_type, logo_size)
+        cached = self._resized_logos.get(key)
+        if cached is None:
+            base = self._logos.get(property_type)
+            if base is None:
+                return None
+            logo_img = base[0].copy()
+            # thumbnail reduce primero con reduce() (reducing_gap) y termina con LANCZOS
+            logo_img.thumbnail((logo_size, logo_size), Image.Resampling.LANCZOS)
+            cached = (logo_img, logo_img.split()[3])
+            self._resized_logos[key] = cached
+        return cached
+        
+    def _logo_placement(self, qr_size: Tuple[int, int], property_type: str) -> Optional[Tuple[Image.Image, Image.Image, Tuple[int, int]]]:
+        """
+        Obtener logo, máscara y posición centrada para un tamaño de QR, memorizados por tamaño.
+        
+        Args:
+            qr_size (Tuple[int, int]): Tamaño (ancho, alto) de la imagen del QR
+            property_type (str): Tipo de propiedad normalizado
+            
+        Returns:
+            Optional[Tuple[Image.Image, Image.Image, Tuple[int, int]]]: (logo, máscara, (x, y)) o None si no hay logo
+        """
+        key = (qr_size, property_type)
+        placement = self._logo_placements.get(key)
+        if placement is None:
+            # Calcular tamaño del logo (27% del código QR) usando solo enteros
+            logo_size = min(qr_size) * 10 // 37
+            # * 10 // 40 = 25% del tamaño del QR (ideal)
+            # * 10 // 35 = 28.5% del tamaño del QR (tamaño recomendado)
+            # * 10 // 30 = 33% del tamaño del QR (máximo recomendado)
+            logo = self._get_logo(property_type, logo_size)
+            if logo is None:
+                return None
+            logo_img, mask = logo
+            
+            # Calcular posición para centrado
+            x_pos = (qr_size[0] - logo_img.size[0]) // 2
+            y_pos = (qr_size[1] - logo_img.size[1]) // 2
+            
+            placement = (logo_img, mask, (x_pos, y_pos))
+            self._logo_placements[key] = placement
+        return placement
+        
+    def generate_wifi_qr(self, credentials: WiFiCredentials) -> Image.Image:
         """
         Generar un código QR para credenciales WiFi.
         
@@ -51,7 +144,7 @@ class QRManager:
             credentials (WiFiCredentials): Credenciales de red WiFi
             
         Returns:
-            BytesIO: Buffer conteniendo la imagen del código QR
+            Image.Image: Imagen del código QR en escala de grises
         """
         try:
             logger.info(f"Generando código QR para SSID: {credentials.ssid}")
@@ -69,88 +162,73 @@ class QRManager:
             qr = segno.make(wifi_config, error='H')
             logger.debug("Código QR generado con nivel de corrección 'H'")
             
-            # Guardar en buffer con escala aumentada para mayor resolución
-            buffer = BytesIO()
-            qr.save(buffer, kind='png', scale=30, border=4)
-            buffer.seek(0)
+            # Rasterizar la matriz directamente (un píxel por módulo) y escalar con NEAREST
+            # para mayor resolución, sin codificar y decodificar un PNG intermedio
+            # (bytes.translate invierte 0/1 a blanco/negro en C, sin un bucle Python por módulo)
+            width, height = qr.symbol_size(scale=1, border=4)
+            pixels = b''.join(
+                bytes(row) for row in qr.matrix_iter(scale=1, border=4)
+            ).translate(_MODULE_TO_GRAY)
+            qr_img = Image.frombytes('L', (width, height), pixels)
+            qr_img = qr_img.resize((width * 30, height * 30), Image.Resampling.NEAREST)
             
             logger.info("Código QR generado exitosamente")
-            return buffer
+            return qr_img
             
         except Exception as e:
             logger.error(f"Error generando código QR: {str(e)}", exc_info=True)
             raise
             
-    def add_logo(self, qr_buffer: BytesIO, property_type: str) -> BytesIO:
+    def add_logo(self, qr_img: Image.Image, property_type: str) -> Image.Image:
         """
         Agregar un logotipo al centro del código QR.
         
         Args:
-            qr_buffer (BytesIO): Buffer conteniendo la imagen del código QR
+            qr_img (Image.Image): Imagen del código QR
             property_type (str): Identificador de propiedad para selección de logotipo
             
         Returns:
-            BytesIO: Buffer conteniendo el código QR modificado
+            Image.Image: Imagen RGB del código QR con el logotipo
         """
         try:
             # Normalizar y validar tipo de propiedad
             property_type = self._normalize_property_type(property_type)
             if not property_type or property_type not in self.LOGO_PATHS:
                 logger.warning(f"Tipo de propiedad inválido: {property_type}")
-                return qr_buffer
+                return qr_img
                 
-            logo_path = self.LOGO_PATHS[property_type]
-            if not os.path.exists(logo_path):
-                logger.error(f"Archivo de logo no encontrado: {logo_path}")
-                return qr_buffer
-                  # Abrir imágenes
-            qr_img = Image.open(qr_buffer).convert('RGB')
-            logo_img = Image.open(logo_path).convert('RGBA')
-            
-            # Calcular tamaño del logo (25% del código QR)
-            logo_size = min(qr_img.size) // 3.7
-            # 4 = 25% del tamaño del QR (ideal)
-            # 3.5 = 28.5% del tamaño del QR (tamaño recomendado)
-            # 3 = 33% del tamaño del QR (máximo recomendado)
-            logo_img.thumbnail((logo_size, logo_size), Image.Resampling.LANCZOS)
-              # Calcular posición para centrado
-            x_pos = (qr_img.size[0] - logo_img.size[0]) // 2
-            y_pos = (qr_img.size[1] - logo_img.size[1]) // 2
+            if property_type not in self._logos:
+                logger.error(f"Logo no disponible para propiedad: {property_type}")
+                return qr_img
+                
+            # Copia RGB de la imagen del QR
+            qr_img = qr_img.convert('RGB')
             
-            # Crear máscara para bordes suaves
-            mask = logo_img.split()[3]
+            # Logo ya redimensionado, con su máscara para bordes suaves y posición centrada
+            logo_img, mask, position = self._logo_placement(qr_img.size, property_type)
             
             # Pegar logo
-            qr_img.paste(logo_img, (x_pos, y_pos), mask)
+            qr_img.paste(logo_img, position, mask)
             
-            # Guardar resultado y convertir a PNG-8
-            output = BytesIO()
-            # Optimizado para menor tamaño usando PNG-8
-            qr_img = qr_img.convert("P", palette=Image.ADAPTIVE)
-            qr_img.save(output, format='PNG', optimize=True)
-            output.seek(0)
-            
-            return output
+            return qr_img
             
         except Exception as e:
             logger.error(f"Error agregando logo al QR: {str(e)}")
-            return qr_buffer
+            return qr_img
             
-    def add_text(self, qr_buffer: BytesIO, ssid: str, password: Optional[str] = None) -> BytesIO:
+    def add_text(self, qr_img: Image.Image, ssid: str, password: Optional[str] = None) -> Image.Image:
         """
         Agregar texto de SSID y contraseña debajo del código QR.
         
         Args:
-            qr_buffer (BytesIO): Buffer conteniendo la imagen del código QR
+            qr_img (Image.Image): Imagen del código QR
             ssid (str): SSID de la red
             password (Optional[str]): Contraseña de la red
             
         Returns:
-            BytesIO: Buffer conteniendo el código QR modificado con el texto
+            Image.Image: Imagen RGB del código QR con el texto
         """
         try:
-            # Abrir la imagen del QR
-            qr_img = Image.open(qr_buffer)
             qr_width, qr_height = qr_img.size
             
             # Crear un nuevo lienzo más alto para agregar el texto
@@ -200,30 +278,25 @@ class QRManager:
                 # Dibujar texto de contraseña
                 draw.text((x_pos, y_pos), pwd_text, font=font, fill="black")
             
-            # Guardar la imagen modificada en un nuevo buffer
-            output = BytesIO()
-            # Convertir a PNG-8 para eficiencia
-            new_img = new_img.convert("P", palette=Image.ADAPTIVE)
-            new_img.save(output, format='PNG', optimize=True)
-            output.seek(0)
-            
-            return output
+            return new_img
             
         except Exception as e:
             logger.error(f"Error agregando texto al QR: {str(e)}")
-            # Si hay error, devolver el buffer original sin modificar
-            qr_buffer.seek(0)
-            return qr_buffer
+            # Si hay error, devolver la imagen original sin modificar
+            return qr_img
             
-    def save_qr(self, qr_buffer: BytesIO, filename: str, ssid: str = "", password: Optional[str] = None) -> str:
+    def save_qr(self, qr_img: Image.Image, filename: str, ssid: str = "", password: Optional[str] = None,
+                compress_level: int = 6, optimize: bool = False) -> str:
         """
-        Guardar el código QR en un archivo.
+        Guardar el código QR en un archivo (única codificación PNG del proceso).
         
         Args:
-            qr_buffer (BytesIO): Buffer conteniendo la imagen del código QR
+            qr_img (Image.Image): Imagen del código QR
             filename (str): Nombre para el archivo de salida
             ssid (str): SSID de la red para añadir como texto
             password (Optional[str]): Contraseña de la red para añadir como texto
+            compress_level (int): Nivel de compresión zlib del PNG (0-9)
+            optimize (bool): Búsqueda exhaustiva de filtros PNG (lenta, ganancia mínima en QR)
             
         Returns:
             str: Ruta al archivo guardado
@@ -233,8 +306,7 @@ class QRManager:
                 filename += '.png'
             
             output_path = os.path.join(self.output_dir, filename)
-              # Abrir la imagen del buffer
-            img = Image.open(qr_buffer).convert('RGB')
+            img = qr_img.convert('RGB')
             
             # Crear un nuevo lienzo con el tamaño estandarizado vertical (825x1100)
             # Usando RGB para mejor eficiencia
@@ -254,7 +326,11 @@ class QRManager:
                 new_height = qr_area_height
                 new_width = int(img_width * (new_height / img_height))
                 
-            resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # LANCZOS solo si el tamaño cambia; reducing_gap reduce antes con reduce() en escalas grandes
+            if img.size == (new_width, new_height):
+                resized_img = img
+            else:
+                resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
               # Calcular posición para centrar el QR en la parte superior del lienzo
             x_pos = (825 - new_width) // 2
             y_pos = 50  # Margen superior de 50px
@@ -264,15 +340,78 @@ class QRManager:
             
             # Convertir a PNG-8 para mayor eficiencia y menor tamaño
             png8_img = standardized_img.convert("P", palette=Image.ADAPTIVE)
-            png8_img.save(output_path, format='PNG', optimize=True)
+            png8_img.save(output_path, format='PNG', optimize=optimize, compress_level=compress_level)
             
-            logger.info(f"Código QR guardado en: {output_path} con formato PNG-8 optimizado y resolución estandarizada vertical de 825x1100")
+            logger.info(f"Código QR guardado en: {output_path} con formato PNG-8 y resolución estandarizada vertical de 825x1100")
             return output_path
             
         except Exception as e:
             logger.error(f"Error guardando código QR: {str(e)}")
             raise
             
+    def create_qr_file(self, credentials: WiFiCredentials, filename: Optional[str] = None,
+                       compress_level: int = 6) -> str:
+        """
+        Generar el código QR completo (logo y texto) y guardarlo en el directorio de salida.
+        
+        Args:
+            credentials (WiFiCredentials): Credenciales de red WiFi
+            filename (Optional[str]): Nombre del archivo; por defecto build_filename(credentials)
+            compress_level (int): Nivel de compresión zlib del PNG (0-9)
+            
+        Returns:
+            str: Ruta al archivo guardado
+        """
+        qr_img = self.generate_wifi_qr(credentials)
+        
+        # Agregar logo si hay propiedad
+        if credentials.property_type:
+            qr_img = self.add_logo(qr_img, credentials.property_type)
+            
+        qr_img = self.add_text(qr_img, credentials.ssid, credentials.password)
+        
+        return self.save_qr(
+            qr_img,
+            filename or self.build_filename(credentials),
+            ssid=credentials.ssid,
+            password=credentials.password,
+            compress_level=compress_level
+        )
+        
+    @staticmethod
+    def sanitize_filename(text: str) -> str:
+        """
+        Conservar solo los caracteres válidos en un nombre de archivo (alfanuméricos, '_', '-' y espacio).
+        
+        Args:
+            text (str): Texto a limpiar
+            
+        Returns:
+            str: Texto apto para formar parte de un nombre de archivo
+        """
+        return ''.join(c for c in text if c.isalnum() or c in '_- ')
+        
+    @staticmethod
+    def build_filename(credentials: WiFiCredentials) -> str:
+        """
+        Construir el nombre del archivo de salida según el tipo de logo y el SSID.
+        
+        Args:
+            credentials (WiFiCredentials): Credenciales de red WiFi
+            
+        Returns:
+            str: Nombre de archivo PNG
+        """
+        sanitized_ssid = QRManager.sanitize_filename(credentials.ssid)
+        
+        # Definir el nombre del archivo según el tipo de logo
+        if credentials.property_type == 'VLEV' or credentials.property_type == 'VLE':
+            return f"VLE_{sanitized_ssid}.png"
+        elif credentials.property_type == 'VDPF' or credentials.property_type == 'Flamingos':
+            return f"VDPF_{sanitized_ssid}.png"
+        # Sin logo o cualquier otro caso
+        return f"WIFI_{sanitized_ssid}.png"
+            
     @staticmethod
     def _normalize_property_type(property_type: Optional[str]) -> Optional[str]:
         """
@@ -294,4 +433,46 @@ class QRManager:
             return 'VDPF'
         elif property_type in ('SIN LOGO', 'NONE', 'NO LOGO'):
             return None
-        return None
\ No newline at end of file
+        return None
+
+def init_worker(output_dir: str, log_queue=None, log_level: int = logging.INFO):
+    """
+    Inicializador de los procesos trabajadores de la generación masiva.
+    
+    Configura el registro del trabajador (por la cola hacia el archivo de la sesión del
+    proceso principal) y crea el QRManager del proceso (logos ya decodificados) al
+    arrancar, en lugar de hacerlo en su primera tarea.
+    
+    Args:
+        output_dir (str): Directorio donde se guardarán los códigos QR
+        log_queue: Cola de LogManager.start_worker_listener; None para registrar solo en consola
+        log_level (int): Nivel de registro del proceso principal
+    """
+    global _worker_manager
+    LogManager.configure_worker(log_queue, log_level)
+    _worker_manager = QRManager(output_dir)
+
+def render_qr_file(credentials: WiFiCredentials, output_dir: str, filename: Optional[str] = None) -> Optional[str]:
+    """
+    Generar y guardar el código QR de unas credenciales desde un proceso trabajador.
+    
+    Función a nivel de módulo para que pueda enviarse a un ProcessPoolExecutor.
+    Cada proceso reutiliza su propio QRManager entre llamadas. El PNG se guarda
+    con BATCH_COMPRESS_LEVEL.
+    
+    Args:
+        credentials (WiFiCredentials): Credenciales de red WiFi
+        output_dir (str): Directorio donde guardar el código QR
+        filename (Optional[str]): Nombre del archivo; por defecto QRManager.build_filename
+        
+    Returns:
+        Optional[str]: Ruta al archivo guardado o None si hubo error
+    """
+    global _worker_manager
+    if _worker_manager is None or _worker_manager.output_dir != output_dir:
+        _worker_manager = QRManager(output_dir)
+    try:
+        return _worker_manager.create_qr_file(credentials, filename, compress_level=BATCH_COMPRESS_LEVEL)
+    except Exception as e:
+        logger.error(f"Error generando código QR para SSID {credentials.ssid}: {str(e)}")
+        return None
@@ -6,15 +6,20 @@ proporcionando opciones para generar códigos QR desde archivos Excel o entrada
 """
 
 import os
+import logging
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
 from typing import Optional, Dict
 import subprocess
 import sys
+import queue
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 
-from ..core.excel_manager import ExcelManager
-from ..core.qr_manager import QRManager, WiFiCredentials
+from ..core.excel_manager import ExcelManager, DEFAULT_ENGINE
+from ..core.qr_manager import QRManager, WiFiCredentials, render_qr_file, init_worker
 from ..utils.logging_utils import LogManager
 from ..utils.config_manager import ConfigManager
 from ..utils.excel_utils import excel_column_to_index, index_to_excel_column
@@ -22,6 +27,10 @@ from ..utils.path_utils import resource_path
 
 logger = LogManager.get_logger(__name__)
 
+# Opciones de seguridad y propiedad compartidas por las pestañas de Excel y manual
+_SECURITY_OPTIONS = ("WPA2", "WPA", "WEP", "nopass")
+_PROPERTY_OPTIONS = ("VLE", "VDPF", "Sin Logo")
+
 class SheetSelectionDialog(tk.Toplevel):
     """Diálogo para seleccionar hoja de Excel."""
     
@@ -58,120 +67,172 @@ class SheetSelectionDialog(tk.Toplevel):
 class ColumnSelectionDialog(tk.Toplevel):
     """Diálogo para seleccionar columnas de Excel manualmente."""
     
-    def __init__(self, parent, initial_columns=None):
+    # Textos y etiquetas constantes del diálogo
+    _LABELS = (
+        ('room', 'Columna Número de Habitación *'),
+        ('ssid', 'Columna SSID *'),
+        ('password', 'Columna Contraseña'),
+        ('encryption', 'Columna Encriptación'),
+        ('property_type', 'Columna Propiedad')
+    )
+    _OPTIONAL_KEYS = ('password', 'encryption', 'property_type')
+    _HELP_TEXT = "Ingrese letras de columnas de Excel (A, B, C, etc.)"
+    _EXAMPLE_TEXT = "Ejemplo: A para la primera columna, B para la segunda, etc.\nUse AA, AB, etc. para columnas después de Z"
+    _REQUIRED_NOTE = "* Campos requeridos"
+    
+    def __init__(self, parent):
         super().__init__(parent)
+        # El diálogo se construye una sola vez y se reutiliza: queda oculto hasta show()
+        self.withdraw()
         self.title("Seleccionar Columnas")
         self.column_indices = None
-        self.initial_columns = initial_columns or {}
+        self._closed = tk.BooleanVar(self, value=False)
         
         # Centrar diálogo
-        self.geometry("400x350")
+        self.geometry("400x400")
         self.resizable(False, False)
         self.transient(parent)
-        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self._on_cancel)
         
         # Marco de selección de columnas
         frame = ttk.LabelFrame(self, text="Letras de Columnas", padding=10)
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         # Texto de ayuda
-        help_text = "Ingrese letras de columnas de Excel (A, B, C, etc.)"
-        ttk.Label(frame, text=help_text, font=("", 9, "italic")).grid(
+        ttk.Label(frame, text=self._HELP_TEXT, font=("", 9, "italic")).grid(
             row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10)
         )
         
-        # Entradas de columnas
-        self.columns = {}
-        labels = {
-            'room': 'Columna Número de Habitación *',
-            'ssid': 'Columna SSID *',
-            'password': 'Columna Contraseña',
-            'encryption': 'Columna Encriptación',
-            'property_type': 'Columna Propiedad'
-        }
+        # Entradas de columnas (se leen directamente con Entry.get()). Cada pulsación se
+        # valida al escribir, así que solo pueden contener letras de columna
+        self.entries = {}
+        vcmd = (self.register(self._is_column_input), '%P')
         
         row = 1
-        for key, label in labels.items():
+        for key, label in self._LABELS:
             ttk.Label(frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
-            initial_value = ""
-            # Si tenemos un valor inicial para esta columna, convertirlo a letra de Excel
-            if key in self.initial_columns and self.initial_columns[key] is not None:
-                initial_value = index_to_excel_column(self.initial_columns[key])
-            var = tk.StringVar(value=initial_value)
-            entry = ttk.Entry(frame, textvariable=var, width=5)
+            entry = ttk.Entry(frame, width=5, validate='key', validatecommand=vcmd)
             entry.grid(row=row, column=1, sticky=tk.W, pady=2)
-            self.columns[key] = var
+            self.entries[key] = entry
             row += 1
             
         # Ejemplo
-        example_text = "Ejemplo: A para la primera columna, B para la segunda, etc.\nUse AA, AB, etc. para columnas después de Z"
-        ttk.Label(frame, text=example_text, font=("", 8)).grid(
+        ttk.Label(frame, text=self._EXAMPLE_TEXT, font=("", 8)).grid(
             row=row, column=0, columnspan=2, sticky=tk.W, pady=(10, 0)
         )
         
         row += 1
-        ttk.Label(frame, text="* Campos requeridos", font=("", 8, "italic")).grid(
+        ttk.Label(frame, text=self._REQUIRED_NOTE, font=("", 8, "italic")).grid(
             row=row, column=0, columnspan=2, sticky=tk.W, pady=10
         )
         
+        # Errores de validación, mostrados en el propio diálogo
+        row += 1
+        self._error_label = ttk.Label(frame, text="", foreground="red", wraplength=360, justify=tk.LEFT)
+        self._error_label.grid(row=row, column=0, columnspan=2, sticky=tk.W)
+        
         # Botones
         btn_frame = ttk.Frame(self)
         btn_frame.pack(pady=10)
         ttk.Button(btn_frame, text="Aceptar", command=self._on_ok).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Cancelar", command=self._on_cancel).pack(side=tk.LEFT)
         
+    def show(self, initial_columns=None) -> Optional[Dict[str, int]]:
+        """
+        Mostrar el diálogo y esperar a que se cierre.
+        
+        Args:
+            initial_columns: Índices de columnas actuales para prellenar las entradas
+            
+        Returns:
+            Optional[Dict[str, int]]: Índices seleccionados, o None si se canceló
+        """
+        initial_columns = initial_columns or {}
+        self.column_indices = None
+        
+        # Restablecer entradas con los valores actuales convertidos a letras de Excel
+        for key, entry in self.entries.items():
+            entry.delete(0, tk.END)
+            if initial_columns.get(key) is not None:
+                entry.insert(0, index_to_excel_column(initial_columns[key]))
+                
+        self._error_label.configure(text="")
+        self._closed.set(False)
+        self.deiconify()
+        self.grab_set()
+        self.entries['room'].focus_set()
+        self.wait_variable(self._closed)
+        return self.column_indices
+        
+    def _close(self):
+        """Ocultar el diálogo en lugar de destruirlo para reutilizarlo."""
+        self.grab_release()
+        self.withdraw()
+        self._closed.set(True)
+        
+    @staticmethod
+    def _is_column_input(proposed: str) -> bool:
+        """Validar el contenido propuesto de una entrada mientras se escribe (vacío o letras)."""
+        return not proposed or (proposed.isascii() and proposed.isalpha())
+        
     def _validate_column_letter(self, column: str) -> bool:
-        """Validar formato de letra de columna de Excel."""
-        if not column:
-            return False
-        return all(c.isalpha() for c in column.upper())
+        """Validar formato de letra de columna de Excel (solo letras ASCII, en C sin bucle Python)."""
+        return bool(column) and column.isascii() and column.isalpha()
         
     def _on_ok(self):
         try:
+            # Alias locales para los bucles de validación y conversión
+            validate = self._validate_column_letter
+            to_index = excel_column_to_index
+            
+            # Leer cada entrada una sola vez
+            values = {key: entry.get().strip() for key, entry in self.entries.items()}
+            
             # Validar campos requeridos
-            room = self.columns['room'].get().strip()
-            ssid = self.columns['ssid'].get().strip()
+            room = values['room']
+            ssid = values['ssid']
             
+            # Acumular todos los errores para mostrarlos juntos
+            errors = []
             if not room or not ssid:
-                messagebox.showerror(
-                    "Error",
-                    "Las columnas de Número de Habitación y SSID son requeridas"
-                )
-                return
+                errors.append("Las columnas de Número de Habitación y SSID son requeridas")
                 
             # Validar formato de letra de columna
-            for key, var in self.columns.items():
-                value = var.get().strip()
-                if value and not self._validate_column_letter(value):
-                    messagebox.showerror(
-                        "Error",
-                        f"Formato de letra de columna inválido para {key}: {value}\n"
-                        "Por favor use solo letras (A-Z, AA-ZZ, etc.)"
-                    )
-                    return
+            invalid_columns = [
+                f"Formato de letra de columna inválido para {key}: {value}"
+                for key, value in values.items()
+                if value and not validate(value)
+            ]
+            if invalid_columns:
+                errors.extend(invalid_columns)
+                errors.append("Por favor use solo letras (A-Z, AA-ZZ, etc.)")
+                
+            if errors:
+                self._error_label.configure(text="\n".join(errors))
+                return
             
             # Convertir letras a índices (basado en cero)
-            self.column_indices = {
-                'room': excel_column_to_index(room),
-                'ssid': excel_column_to_index(ssid)
+            column_indices = {
+                'room': to_index(room),
+                'ssid': to_index(ssid)
             }
             
             # Agregar columnas opcionales
-            for key in ['password', 'encryption', 'property_type']:
-                value = self.columns[key].get().strip()
+            for key in self._OPTIONAL_KEYS:
+                value = values[key]
                 if value:
-                    self.column_indices[key] = excel_column_to_index(value)
+                    column_indices[key] = to_index(value)
                     
-            self.destroy()
+            self.column_indices = column_indices
+            self._close()
             
         except ValueError as e:
-            messagebox.showerror(
-                "Error",
-                str(e) or "Formato de letra de columna inválido.\nPor favor use solo letras (A-Z, AA-ZZ, etc.)"
+            self._error_label.configure(
+                text=str(e) or "Formato de letra de columna inválido.\nPor favor use solo letras (A-Z, AA-ZZ, etc.)"
             )
             
     def _on_cancel(self):
-        self.destroy()
+        self._close()
 
 class PasswordDialog(tk.Toplevel):
     """Diálogo para ingresar contraseña de administrador."""
@@ -240,6 +301,15 @@ class PasswordDialog(tk.Toplevel):
 class MainWindow:
     """Ventana principal para el generador de códigos QR."""
     
+    # Número máximo de vistas previas guardadas en caché
+    PREVIEW_CACHE_SIZE = 32
+    # Espera (ms) tras el último Enter en la búsqueda de habitación antes de generar
+    ROOM_QR_DEBOUNCE_MS = 150
+    # Espera tras elegir un libro (la rueda del ratón recorre el combobox elemento a elemento)
+    FILE_SELECT_DEBOUNCE_MS = 250
+    # ProcessPoolExecutor en Windows no admite más de 61 procesos (límite de WaitForMultipleObjects)
+    MAX_BATCH_WORKERS = 61
+    
     def __init__(self):
         """Inicializar la ventana principal y sus componentes."""
         # Obtener logger para esta clase
@@ -261,6 +331,39 @@ class MainWindow:
         # Variable para controlar si se ha desbloqueado la configuración avanzada
         self.admin_unlocked = False
         
+        # Hilo único para guardar el QR y preparar su vista previa fuera del hilo de Tk
+        self._preview_executor = ThreadPoolExecutor(max_workers=1)
+        # Resultados de hilos secundarios; solo el hilo de Tk los consume (ver _drain_queue)
+        self._work_q = queue.Queue()
+        # Resultados aún por llegar y revisión programada de la cola (solo mientras haya alguno)
+        self._outstanding = 0
+        self._drain_job = None
+        
+        # Nombre mostrado en el combobox de archivos recientes -> ruta completa
+        self._file_paths: Dict[str, str] = {}
+        # Versión de la lista de recientes mostrada (ver ConfigManager.recent_version)
+        self._recent_version = -1
+        
+        # Carga de libro en curso y último archivo pedido mientras tanto (ver _load_excel_file)
+        self._excel_busy = False
+        self._file_select_job = None
+        self._room_qr_job = None
+        
+        # Último QR guardado; el indicador evita comprobar el disco al abrirlo
+        self.last_qr_path = None
+        self._last_qr_valid = False
+        
+        # Diálogo de columnas reutilizable (se crea la primera vez que se abre)
+        self._col_dialog = None
+        
+        # Motor de lectura de Excel: calamine si está instalado, si no openpyxl
+        self._excel_engine = DEFAULT_ENGINE
+        
+        # Caché LRU de QR generados por credenciales (vista previa, archivo y su fecha)
+        # y número de la última vista previa solicitada
+        self._preview_cache = OrderedDict()
+        self._preview_seq = 0
+        
         # Inicializar gestores
         try:
             self.qr_manager = QRManager()
@@ -276,6 +379,10 @@ class MainWindow:
         self.use_excel_property = tk.BooleanVar(value=True)
         self.logger.debug(f"Variables de toggles inicializadas: security={self.use_excel_security.get()}, property={self.use_excel_property.get()}")
         
+        # Construir la interfaz con la ventana oculta y mostrarla ya distribuida,
+        # en lugar de dibujar cada paso intermedio
+        self.root.withdraw()
+        
         # Configurar componentes de la UI
         self._setup_ui()
         
@@ -285,6 +392,12 @@ class MainWindow:
         # Asegurar que las opciones de Excel estén deshabilitadas por defecto
         self._toggle_admin_controls(False)
         
+        # Al cerrar, liberar el hilo de guardado y el libro abierto
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        self.root.update_idletasks()
+        self.root.deiconify()
+        
         self.logger.info("Ventana principal inicializada correctamente")
         
     def _setup_styles(self):
@@ -307,11 +420,46 @@ class MainWindow:
 
     def _load_excel_file(self, filename: str):
         """Cargar un archivo Excel específico."""
+        # Los controles de archivo están bloqueados durante una carga; no leer dos libros a la vez
+        if self._excel_busy:
+            self.logger.debug(f"Carga de libro en curso, se ignora: {filename}")
+            return
+            
         self.file_path.set(filename)
-        self.excel_manager = ExcelManager(filename)
+        self.file_combo.set(self._file_label(filename))
         
-        # Intentar cargar el libro
-        success, error_msg = self.excel_manager.load_workbook()
+        # Volver a elegir el libro ya cargado no lo relee si el archivo no cambió
+        if (self.excel_manager is not None and self.excel_manager.file_path == filename
+                and self.excel_manager.is_current()):
+            self.logger.debug(f"Libro ya cargado y sin cambios, se reutiliza: {filename}")
+            return
+            
+        # Liberar el archivo anterior: en modo read_only openpyxl lo mantiene abierto
+        if self.excel_manager:
+            self.excel_manager.close()
+        self.excel_manager = ExcelManager(filename, read_only=True, data_only=True, engine=self._excel_engine)
+        
+        # Cargar el libro en un hilo secundario para no bloquear la interfaz
+        self._excel_busy = True
+        self._set_loading_state(True)
+        self._expect_result()
+        threading.Thread(target=self._bg_load, args=(self.excel_manager,), daemon=True).start()
+        
+    def _bg_load(self, excel_manager: ExcelManager):
+        """Cargar el libro fuera del hilo de Tk; los widgets se actualizan en _on_workbook_loaded."""
+        success, error_msg = excel_manager.load_workbook()
+        self._work_q.put(("loaded", excel_manager, success, error_msg))
+        
+    def _on_workbook_loaded(self, excel_manager: ExcelManager, success: bool, error_msg: str):
+        """Actualizar la interfaz al terminar la carga del libro (hilo de Tk)."""
+        self._excel_busy = False
+        self._set_loading_state(False)
+        
+        # Ignorar cargas que quedaron obsoletas (la interfaz de Excel se reinició mientras tanto)
+        if excel_manager is not self.excel_manager:
+            excel_manager.close()
+            return
+            
         if not success:
             messagebox.showerror("Error", error_msg)
             self._reset_excel_ui()
@@ -322,7 +470,7 @@ class MainWindow:
         self.sheet_combo['values'] = sheets
         
         # Intentar seleccionar última hoja usada
-        last_sheet = self.config_manager.get_last_sheet(filename)
+        last_sheet = self.config_manager.get_last_sheet(excel_manager.file_path)
         if last_sheet and last_sheet in sheets:
             self.sheet_combo.set(last_sheet)
         else:
@@ -333,6 +481,23 @@ class MainWindow:
         # Actualizar lista de archivos recientes inmediatamente
         self._update_recent_files_list()
 
+    def _set_loading_state(self, loading: bool):
+        """Indicar la carga del libro y bloquear mientras dura los controles que usan excel_manager."""
+        if loading:
+            self.root.config(cursor="watch")
+            self.load_progress.grid()
+            self.load_progress.start(15)
+            # El libro anterior ya está cerrado y el nuevo aún no tiene hoja activa
+            for widget in (self.file_combo, self.browse_btn, self.sheet_combo, self.load_sheet_btn,
+                           self.room_entry, self.generate_btn, self.generate_all_btn, self.manual_cols_btn):
+                widget['state'] = 'disabled'
+        else:
+            self.root.config(cursor="")
+            self.load_progress.stop()
+            self.load_progress.grid_remove()
+            self.file_combo['state'] = 'readonly'
+            self.browse_btn['state'] = 'normal'
+            
     def _setup_ui(self):
         """Configurar todos los componentes de la UI."""
         # Crear marco principal para las dos columnas
@@ -384,14 +549,38 @@ class MainWindow:
         self.config_label.pack(pady=(0, 10), padx=5)
         
         # Crear una imagen en blanco del tamaño deseado para establecer las dimensiones iniciales
+        # Esta PhotoImage se reutiliza en cada vista previa (ver _on_qr_saved).
         blank_image = Image.new('RGB', (300, 300), 'white')
-        photo = ImageTk.PhotoImage(blank_image)
-        self.preview_label.configure(image=photo)
-        self.preview_label.image = photo
+        self._preview_photo = ImageTk.PhotoImage(blank_image)
+        self.preview_label.configure(image=self._preview_photo)
         
         # Botones comunes en la parte inferior de la ventana principal
         self._setup_common_buttons()
         
+    def _expect_result(self):
+        """Anotar un resultado pendiente de un hilo secundario y revisar la cola mientras llegue."""
+        self._outstanding += 1
+        if self._drain_job is None:
+            self._drain_job = self.root.after(50, self._drain_queue)
+            
+    def _drain_queue(self):
+        """Procesar en el hilo de Tk los resultados publicados por hilos secundarios."""
+        self._drain_job = None
+        try:
+            while True:
+                kind, *payload = self._work_q.get_nowait()
+                self._outstanding -= 1
+                if kind == "loaded":
+                    self._on_workbook_loaded(*payload)
+                elif kind == "qr":
+                    self._on_qr_saved(*payload)
+        except queue.Empty:
+            pass
+        finally:
+            # Reprogramar solo si queda trabajo pendiente, aunque un manejador haya fallado
+            if self._outstanding > 0 and self._drain_job is None:
+                self._drain_job = self.root.after(50, self._drain_queue)
+        
     def _setup_common_buttons(self):
         """Configurar botones comunes para ambas pestañas."""
         button_frame = ttk.Frame(self.root)
@@ -421,19 +610,25 @@ class MainWindow:
         # Etiqueta "Libro:" + combobox + botón "Examinar"
         ttk.Label(file_content_frame, text="Libro:").grid(row=0, column=0, sticky="w", padx=5)
         
+        # file_path guarda la ruta completa; el combobox muestra solo el nombre del archivo
         self.file_path = tk.StringVar()
         self.file_combo = ttk.Combobox(
             file_content_frame, 
-            textvariable=self.file_path, 
             state="readonly"
         )
         self.file_combo.grid(row=0, column=1, sticky="ew", padx=5)
-        self.file_combo.bind('<<ComboboxSelected>>', self._on_file_selected)
+        self.file_combo.bind('<<ComboboxSelected>>', self._schedule_file_selected)
         
         # Actualizar valores del Combobox con archivos recientes
         self._update_recent_files_list()
         
-        ttk.Button(file_content_frame, text="Examinar", command=self._browse_new_excel).grid(row=0, column=2, padx=5)
+        self.browse_btn = ttk.Button(file_content_frame, text="Examinar", command=self._browse_new_excel)
+        self.browse_btn.grid(row=0, column=2, padx=5)
+        
+        # Indicador de carga del libro: solo visible mientras se lee en segundo plano
+        self.load_progress = ttk.Progressbar(file_content_frame, mode="indeterminate")
+        self.load_progress.grid(row=1, column=0, columnspan=3, sticky="ew", padx=5, pady=(5, 0))
+        self.load_progress.grid_remove()
 
         # Selección de hoja
         sheet_frame = ttk.Frame(file_frame)
@@ -483,30 +678,25 @@ class MainWindow:
         )
         self.security_switch_label.pack(side=tk.LEFT, padx=5)
         
-        # Frame para los radio buttons de seguridad
-        security_radios_frame = ttk.Frame(security_frame)
-        security_radios_frame.pack(fill=tk.X, expand=True, side=tk.TOP)
+        # Frame para la selección de seguridad por defecto
+        security_select_frame = ttk.Frame(security_frame)
+        security_select_frame.pack(fill=tk.X, expand=True, side=tk.TOP)
         
-        ttk.Label(security_radios_frame, text="Tipo de Seguridad por Defecto:").pack(side=tk.LEFT, padx=5)
+        ttk.Label(security_select_frame, text="Tipo de Seguridad por Defecto:").pack(side=tk.LEFT, padx=5)
         
-        # Variable y radio buttons para método de seguridad
+        # Variable y combobox (un solo widget) para método de seguridad
         self.security_var = tk.StringVar(value="WPA2")
         # Añadir trace a la variable para guardar configuración al cambiar
         self.security_var.trace_add("write", lambda *args: self._save_sheet_config())
-        self.security_radios = []
-        
-        radio_frame = ttk.Frame(security_radios_frame)
-        radio_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        for security in ["WPA2", "WPA", "WEP", "nopass"]:
-            radio = ttk.Radiobutton(
-                radio_frame,
-                text=security,
-                variable=self.security_var,
-                value=security
-            )
-            radio.pack(side=tk.LEFT, padx=10)
-            self.security_radios.append(radio)
+        self.security_combo = ttk.Combobox(
+            security_select_frame,
+            textvariable=self.security_var,
+            values=_SECURITY_OPTIONS,
+            state="readonly",
+            width=8
+        )
+        self.security_combo.pack(side=tk.LEFT, padx=5)
             
         # Frame para selección de propiedad con toggle switch
         property_frame = ttk.Frame(options_container)
@@ -546,20 +736,12 @@ class MainWindow:
         self.property_var = tk.StringVar(value="VDPF")
         # Añadir trace a la variable para guardar configuración al cambiar
         self.property_var.trace_add("write", lambda *args: self._save_sheet_config())
-        self.property_radios = []
-        
         property_radio_frame = ttk.Frame(property_radios_frame)
         property_radio_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        for property_type in ["VLE", "VDPF", "Sin Logo"]:
-            radio = ttk.Radiobutton(
-                property_radio_frame,
-                text=property_type,
-                variable=self.property_var,
-                value=property_type
-            )
-            radio.pack(side=tk.LEFT, padx=10)
-            self.property_radios.append(radio)
+        self.property_radios = self._build_radio_group(
+            property_radio_frame, self.property_var, _PROPERTY_OPTIONS
+        )
             
         # Mensaje informativo para configuración manual
         self.manual_config_label = ttk.Label(
@@ -590,11 +772,10 @@ class MainWindow:
         search_content_frame.pack(fill=tk.X, expand=True)
         search_content_frame.grid_columnconfigure(0, weight=1)
         
-        self.room_number = tk.StringVar()
-        self.room_entry = ttk.Entry(search_content_frame, textvariable=self.room_number, state="disabled")
+        self.room_entry = ttk.Entry(search_content_frame, state="disabled")
         self.room_entry.grid(row=0, column=0, sticky="ew", padx=5)
-        # Vincular Enter para generar QR de la habitación
-        self.room_entry.bind('<Return>', lambda e: self._generate_room_qr())
+        # Vincular Enter para generar QR de la habitación (agrupando la repetición de tecla)
+        self.room_entry.bind('<Return>', lambda e: self._schedule_room_qr())
         
         button_frame = ttk.Frame(search_content_frame)
         button_frame.grid(row=0, column=1, sticky="e")
@@ -609,10 +790,14 @@ class MainWindow:
         
     def _browse_new_excel(self):
         """Abrir diálogo para seleccionar nuevo archivo Excel."""
+        # Abrir en la última carpeta usada, con el archivo actual preseleccionado
         filename = filedialog.askopenfilename(
+            initialdir=self.config_manager.get_last_dir(),
+            initialfile=os.path.basename(self.file_path.get()),
             filetypes=[("Archivos Excel", "*.xlsx *.xls"), ("Todos los archivos", "*.*")]
         )
         if filename:
+            self.config_manager.set_last_dir(os.path.dirname(filename))
             self._load_excel_file(filename)
             
     def _enable_sheet_selection(self):
@@ -740,6 +925,26 @@ class MainWindow:
                 
         self.logger.debug(f"Configuración cargada exitosamente para hoja '{sheet_name}'")
         
+    def _build_radio_group(self, parent: ttk.Frame, variable: tk.StringVar, values: tuple, padx: int = 10) -> list:
+        """
+        Crear una fila de radio buttons que comparten la misma variable.
+        
+        Args:
+            parent (ttk.Frame): Contenedor de los radio buttons
+            variable (tk.StringVar): Variable asociada al grupo
+            values (tuple): Valores del grupo (también se usan como texto)
+            padx (int): Separación horizontal entre opciones
+            
+        Returns:
+            list: Radio buttons creados, en el mismo orden que values
+        """
+        radios = []
+        for value in values:
+            radio = ttk.Radiobutton(parent, text=value, variable=variable, value=value)
+            radio.pack(side=tk.LEFT, padx=padx)
+            radios.append(radio)
+        return radios
+        
     def _update_security_switch_state(self, save_config=True):
         """Actualizar estado de los controles según la opción de obtener seguridad desde Excel."""
         if self.use_excel_security.get():
@@ -748,18 +953,16 @@ class MainWindow:
                 text="ON - Los valores de seguridad en Excel, tienen preferencia.",
                 foreground="green"
             )
-            # Ya no desactivamos los radio buttons, permanecen activos
-            for radio in self.security_radios:
-                radio['state'] = 'normal'
+            # Ya no desactivamos la selección, permanece activa
+            self.security_combo['state'] = 'readonly'
         else:
             # Está desactivado - Cambiar etiqueta a OFF
             self.security_switch_label.config(
                 text="OFF - Se usará el tipo seleccionado por defecto.",
                 foreground="gray"
             )
-            # Activar radio buttons de seguridad
-            for radio in self.security_radios:
-                radio['state'] = 'normal'
+            # Activar selección de seguridad
+            self.security_combo['state'] = 'readonly'
                 
         # Guardar la configuración actualizada si se solicita
         if save_config:
@@ -803,15 +1006,16 @@ class MainWindow:
         
         # SSID
         ttk.Label(form_frame, text="SSID:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.manual_ssid = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=self.manual_ssid).grid(
+        # Las entradas se leen directamente con get(), sin StringVar
+        self.manual_ssid_entry = ttk.Entry(form_frame)
+        self.manual_ssid_entry.grid(
             row=0, column=1, sticky="ew", padx=5, pady=2
         )
         
         # Contraseña
         ttk.Label(form_frame, text="Contraseña:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.manual_password = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=self.manual_password).grid(
+        self.manual_password_entry = ttk.Entry(form_frame)
+        self.manual_password_entry.grid(
             row=1, column=1, sticky="ew", padx=5, pady=2
         )
         
@@ -824,13 +1028,7 @@ class MainWindow:
         security_radio_frame = ttk.Frame(security_frame)
         security_radio_frame.pack(fill=tk.X, expand=True, padx=5, pady=5)
         
-        for security in ["WPA2", "WPA", "WEP", "nopass"]:
-            ttk.Radiobutton(
-                security_radio_frame,
-                text=security,
-                variable=self.manual_security_var,
-                value=security
-            ).pack(side=tk.LEFT, padx=10)
+        self._build_radio_group(security_radio_frame, self.manual_security_var, _SECURITY_OPTIONS)
         
         # Logo/Propiedad
         property_frame = ttk.LabelFrame(parent, text="Propiedad", padding=5)
@@ -841,13 +1039,7 @@ class MainWindow:
         property_radio_frame = ttk.Frame(property_frame)
         property_radio_frame.pack(fill=tk.X, expand=True, padx=5, pady=5)
         
-        for property_type in ["VLE", "VDPF", "Sin Logo"]:
-            ttk.Radiobutton(
-                property_radio_frame,
-                text=property_type,
-                variable=self.manual_property_var,
-                value=property_type
-            ).pack(side=tk.LEFT, padx=10)
+        self._build_radio_group(property_radio_frame, self.manual_property_var, _PROPERTY_OPTIONS)
             
         # Botón de generación
         button_frame = ttk.Frame(parent)
@@ -862,13 +1054,13 @@ class MainWindow:
     def _generate_manual_qr(self):
         """Generar QR desde datos ingresados manualmente."""
         # Validar SSID (requerido)
-        ssid = self.manual_ssid.get().strip()
+        ssid = self.manual_ssid_entry.get().strip()
         if not ssid:
             messagebox.showerror("Error", "El SSID es obligatorio")
             return
             
         # Obtener otros valores
-        password = self.manual_password.get().strip() or None
+        password = self.manual_password_entry.get().strip() or None
         security = self.manual_security_var.get()
         property_type = self.manual_property_var.get()
         
@@ -884,59 +1076,16 @@ class MainWindow:
         )
         
         # Generar QR
-        self._generate_and_show_qr(credentials, ssid)
+        self._generate_and_show_qr(credentials)
         
-    def _generate_and_show_qr(self, credentials: WiFiCredentials, filename_prefix: str = "qr"):
+    def _generate_and_show_qr(self, credentials: WiFiCredentials):
         """
-        Generar un código QR y mostrarlo en la interfaz.
+        Generar un código QR, mostrarlo en la interfaz y guardarlo con QRManager.build_filename.
         
         Args:
             credentials (WiFiCredentials): Credenciales de WiFi para el QR
-            filename_prefix (str): Prefijo para el nombre del archivo guardado (normalmente el SSID)
         """
         try:
-            # Generar QR básico
-            qr_buffer = self.qr_manager.generate_wifi_qr(credentials)
-            
-            # Agregar logo si hay propiedad
-            if credentials.property_type:
-                qr_buffer = self.qr_manager.add_logo(qr_buffer, credentials.property_type)
-                
-            # Agregar texto al buffer
-            qr_buffer = self.qr_manager.add_text(qr_buffer, credentials.ssid, credentials.password)
-            
-            # Asegurarse de que el buffer se resetea para leer desde el principio
-            qr_buffer.seek(0)
-            
-            # Abrir la imagen para mostrarla
-            qr_img = Image.open(qr_buffer)
-            
-            # Obtener dimensiones del área de visualización
-            preview_width = 300  # Ancho fijo del área de previsualización
-            preview_height = 300  # Alto fijo del área de previsualización
-            
-            # Redimensionar manteniendo la proporción solo para la visualización
-            img_width, img_height = qr_img.size
-            ratio = min(preview_width/img_width, preview_height/img_height)
-            new_size = (int(img_width * ratio), int(img_height * ratio))
-            
-            # Crear una imagen redimensionada solo para la visualización
-            display_img = qr_img.resize(new_size, Image.LANCZOS)
-            
-            # Crear un fondo blanco del tamaño del área de visualización
-            background = Image.new('RGB', (preview_width, preview_height), 'white')
-            
-            # Calcular posición para centrar la imagen redimensionada
-            offset = ((preview_width - new_size[0]) // 2, (preview_height - new_size[1]) // 2)
-            
-            # Pegar la imagen redimensionada en el fondo blanco
-            background.paste(display_img, offset)
-            
-            # Mostrar en la interfaz
-            photo = ImageTk.PhotoImage(background)
-            self.preview_label.configure(image=photo)
-            self.preview_label.image = photo
-            
             # Actualizar etiqueta de configuración
             config_text = f"SSID: {credentials.ssid}\n"
             if credentials.password:
@@ -947,25 +1096,35 @@ class MainWindow:
             
             self.config_label.configure(text=config_text)
             
-            # Guardar QR en archivo (usando el buffer original sin redimensionar)
-            sanitized_ssid = ''.join(c for c in credentials.ssid if c.isalnum() or c in '_- ')
+            # Si estas credenciales se generaron hace poco y su archivo sigue siendo el que se
+            # guardó entonces, no se vuelve a generar ni a guardar: basta la vista previa en caché
+            self._preview_seq += 1
+            seq = self._preview_seq
+            preview_key = (credentials.ssid, credentials.password, credentials.encryption, credentials.property_type)
+            if self._use_cached_qr(preview_key):
+                return True
+                
+            # Generar QR básico (imagen PIL; solo se codifica a PNG al guardar)
+            qr_img = self.qr_manager.generate_wifi_qr(credentials)
             
-            # Definir el nombre del archivo según el tipo de logo
-            if credentials.property_type == 'VLEV' or credentials.property_type == 'VLE':
-                filename = f"VLE_{sanitized_ssid}.png"
-            elif credentials.property_type == 'VDPF' or credentials.property_type == 'Flamingos':
-                filename = f"VDPF_{sanitized_ssid}.png"
-            else:
-                # Sin logo o cualquier otro caso
-                filename = f"WIFI_{sanitized_ssid}.png"
+            # Agregar logo si hay propiedad
+            if credentials.property_type:
+                qr_img = self.qr_manager.add_logo(qr_img, credentials.property_type)
+                
+            # Agregar texto a la imagen
+            qr_img = self.qr_manager.add_text(qr_img, credentials.ssid, credentials.password)
             
-            # Guardar la imagen final con los mismos datos (texto ya incluido en el buffer)
-            self.last_qr_path = self.qr_manager.save_qr(
-                qr_buffer, 
-                filename, 
-                ssid=credentials.ssid, 
-                password=credentials.password
+            # Guardar el PNG y preparar la vista previa en el hilo secundario.
+            # La imagen pasa a ese hilo: el hilo de Tk ya no la usa
+            future = self._preview_executor.submit(
+                self._save_and_render,
+                qr_img,
+                QRManager.build_filename(credentials),
+                credentials.ssid,
+                credentials.password
             )
+            self._expect_result()
+            future.add_done_callback(lambda f: self._work_q.put(("qr", f, preview_key, seq)))
             
             return True
             
@@ -974,9 +1133,129 @@ class MainWindow:
             logger.error(f"Error en _generate_and_show_qr: {str(e)}")
             return False
             
+    def _use_cached_qr(self, preview_key: tuple) -> bool:
+        """
+        Mostrar un QR generado recientemente sin volver a generarlo ni guardarlo.
+        
+        Solo se usa la caché si el archivo guardado no ha cambiado desde entonces: otras
+        credenciales con el mismo SSID, o la generación masiva, escriben el mismo nombre.
+        
+        Args:
+            preview_key (tuple): (ssid, contraseña, encriptación, propiedad)
+            
+        Returns:
+            bool: True si se mostró el QR de la caché
+        """
+        cached = self._preview_cache.get(preview_key)
+        if cached is None:
+            return False
+        preview, saved_path, saved_mtime = cached
+        try:
+            if os.stat(saved_path).st_mtime_ns != saved_mtime:
+                return False
+        except OSError:
+            return False
+            
+        self._preview_cache.move_to_end(preview_key)
+        self._preview_photo.paste(preview)
+        self.last_qr_path = saved_path
+        self._last_qr_valid = True
+        return True
+        
+    def _save_and_render(self, qr_img: Image.Image, filename: str, ssid: str, password: Optional[str]) -> tuple:
+        """
+        Guardar el código QR y preparar su vista previa (se ejecuta fuera del hilo de Tk).
+        
+        Args:
+            qr_img (Image.Image): Imagen final del código QR
+            filename (str): Nombre del archivo de salida
+            ssid (str): SSID de la red
+            password (Optional[str]): Contraseña de la red
+            
+        Returns:
+            tuple: (ruta guardada, fecha de modificación en ns, vista previa)
+        """
+        saved_path = self.qr_manager.save_qr(qr_img, filename, ssid=ssid, password=password)
+        return saved_path, os.stat(saved_path).st_mtime_ns, self._render_preview(qr_img)
+        
+    @staticmethod
+    def _render_preview(qr_img: Image.Image) -> Image.Image:
+        """
+        Preparar la imagen de vista previa de 300x300 (se ejecuta fuera del hilo de Tk).
+        
+        Args:
+            qr_img (Image.Image): Imagen final del código QR
+        
+        Returns:
+            Image.Image: Imagen centrada sobre fondo blanco del tamaño del área de vista previa
+        """
+        # Obtener dimensiones del área de visualización
+        preview_width = 300  # Ancho fijo del área de previsualización
+        preview_height = 300  # Alto fijo del área de previsualización
+        
+        # Redimensionar manteniendo la proporción solo para la visualización
+        img_width, img_height = qr_img.size
+        ratio = min(preview_width/img_width, preview_height/img_height)
+        new_size = (int(img_width * ratio), int(img_height * ratio))
+        
+        # Crear una imagen redimensionada solo para la visualización. El QR son módulos
+        # blanco/negro: BOX (promedio) basta para reducir y NEAREST para ampliar
+        # Si la imagen ya tiene el tamaño final se usa tal cual, sin remuestrear
+        display_img = qr_img.convert('RGB')
+        if new_size != display_img.size:
+            resample = Image.Resampling.BOX if ratio < 1 else Image.Resampling.NEAREST
+            display_img = display_img.resize(new_size, resample)
+        
+        # Crear un fondo blanco del tamaño del área de visualización
+        background = Image.new('RGB', (preview_width, preview_height), 'white')
+        
+        # Calcular posición para centrar la imagen redimensionada
+        offset = ((preview_width - new_size[0]) // 2, (preview_height - new_size[1]) // 2)
+        
+        # Pegar la imagen redimensionada en el fondo blanco
+        background.paste(display_img, offset)
+        
+        return background
+        
+    def _on_qr_saved(self, future, preview_key: tuple, seq: int):
+        """Registrar el QR guardado y mostrar la vista previa calculada en segundo plano (hilo de Tk)."""
+        try:
+            saved_path, saved_mtime, preview = future.result()
+        except Exception as e:
+            logger.error(f"Error guardando código QR: {str(e)}")
+            messagebox.showerror("Error", f"Error generando código QR: {str(e)}")
+            return
+            
+        self.last_qr_path = saved_path
+        self._last_qr_valid = True
+            
+        try:
+            # Guardar en la caché LRU junto con el archivo que le corresponde
+            self._preview_cache[preview_key] = (preview, saved_path, saved_mtime)
+            self._preview_cache.move_to_end(preview_key)
+            if len(self._preview_cache) > self.PREVIEW_CACHE_SIZE:
+                self._preview_cache.popitem(last=False)
+                
+            # Mostrar solo si no se ha pedido una vista previa más reciente
+            if seq == self._preview_seq:
+                # Copiar los píxeles en la misma imagen de Tk
+                self._preview_photo.paste(preview)
+        except Exception as e:
+            logger.error(f"Error mostrando vista previa: {str(e)}")
+            
+    def _schedule_room_qr(self):
+        """Generar el QR de la habitación tras una pausa, para que una ráfaga de Enter genere uno solo."""
+        if self._room_qr_job is not None:
+            self.root.after_cancel(self._room_qr_job)
+        self._room_qr_job = self.root.after(self.ROOM_QR_DEBOUNCE_MS, self._generate_room_qr)
+        
     def _generate_room_qr(self):
         """Generar código QR para la habitación especificada."""
-        room = self.room_number.get().strip()
+        # Descartar un Enter pendiente: esta llamada ya genera el QR
+        if self._room_qr_job is not None:
+            self.root.after_cancel(self._room_qr_job)
+            self._room_qr_job = None
+        room = self.room_entry.get().strip()
         if not room:
             messagebox.showerror("Error", "Por favor ingrese un número de habitación")
             return
@@ -999,7 +1278,7 @@ class MainWindow:
             credentials.property_type = None if property_val == "Sin Logo" else property_val
             
         # Generar QR
-        self._generate_and_show_qr(credentials, f"{room}")
+        self._generate_and_show_qr(credentials)
             
     def _generate_all_qr(self):
         """Generar códigos QR para todas las habitaciones."""
@@ -1007,12 +1286,31 @@ class MainWindow:
             messagebox.showerror("Error", "No hay hoja de Excel cargada")
             return
         
-        all_rooms = self.excel_manager.get_all_rooms()
+        # Los valores de la interfaz se aplican al leer la hoja según la configuración
+        property_val = self.property_var.get()
+        all_rooms = self.excel_manager.get_all_rooms(
+            default_encryption=self.security_var.get(),
+            default_property_type=None if property_val == "Sin Logo" else property_val,
+            use_sheet_encryption=self.use_excel_security.get(),
+            use_sheet_property=self.use_excel_property.get()
+        )
         if not all_rooms:
             messagebox.showerror("Error", "No se encontraron habitaciones en la hoja seleccionada")
             return
         
+        # Habitaciones con credenciales idénticas producen el mismo archivo: generar cada QR
+        # una sola vez. Se hace antes de confirmar para que el total mostrado sea el real
+        unique_rooms = {}
+        for room_data in all_rooms:
+            key = (room_data.ssid, room_data.password, room_data.encryption, room_data.property_type)
+            unique_rooms.setdefault(key, room_data)
+        duplicates = len(all_rooms) - len(unique_rooms)
+        if duplicates:
+            self.logger.info(f"Se omiten {duplicates} habitaciones con credenciales duplicadas")
+        all_rooms = list(unique_rooms.values())
+        
         # Diálogo de confirmación avanzada
+        duplicate_note = f" ({duplicates} habitaciones comparten credenciales y se omiten)" if duplicates else ""
         confirm_dialog = tk.Toplevel(self.root)
         confirm_dialog.title("Confirmar generación masiva")
         confirm_dialog.grab_set()
@@ -1020,7 +1318,7 @@ class MainWindow:
         
         label = ttk.Label(
             confirm_dialog, 
-            text=f"Se generarán {len(all_rooms)} códigos QR. Este proceso no se puede cancelar. \n\nPara continuar, escriba exactamente: Generar Todo",
+            text=f"Se generarán {len(all_rooms)} códigos QR{duplicate_note}. Este proceso no se puede cancelar. \n\nPara continuar, escriba exactamente: Generar Todo",
             justify=tk.LEFT,
             wraplength=350
         )
@@ -1059,13 +1357,17 @@ class MainWindow:
         if not confirmed['value']:
             return
         
+        total = len(all_rooms)
+        
         # Diálogo de progreso/cancelación
         progress_dialog = tk.Toplevel(self.root)
         progress_dialog.title("Generando códigos QR")
         progress_dialog.grab_set()
         progress_dialog.resizable(False, False)
         ttk.Label(progress_dialog, text="Generando códigos QR, por favor espere...", font=("", 11)).pack(padx=20, pady=(20, 10))
-        progress_var = tk.StringVar(value="0 / {}".format(len(all_rooms)))
+        progress_bar = ttk.Progressbar(progress_dialog, mode="determinate", maximum=total, length=300)
+        progress_bar.pack(padx=20, pady=(0, 5))
+        progress_var = tk.StringVar(value="0 / {}".format(total))
         progress_label = ttk.Label(progress_dialog, textvariable=progress_var, font=("", 10))
         progress_label.pack(pady=(0, 10))
         cancel_flag = {'cancel': False}
@@ -1075,31 +1377,123 @@ class MainWindow:
         cancel_btn = ttk.Button(progress_dialog, text="Cancelar", command=on_cancel_progress)
         cancel_btn.pack(pady=(0, 15))
         progress_dialog.protocol("WM_DELETE_WINDOW", on_cancel_progress)
-        self.root.update()  # Cambiado de update_idletasks() a update() para permitir eventos
         
-        count = 0
-        for idx, room_data in enumerate(all_rooms, 1):
+        # Generar QR en paralelo: cada habitación es independiente (QR, logo, texto y guardado)
+        output_dir = self.qr_manager.output_dir
+        executor, log_listener = self._create_batch_executor(min(os.cpu_count() or 1, self.MAX_BATCH_WORKERS), output_dir)
+        futures = {
+            executor.submit(render_qr_file, room_data, output_dir, filename): room_data
+            for room_data, filename in zip(all_rooms, self._batch_filenames(all_rooms))
+        }
+        # Los fallos se acumulan y se muestran en un solo resumen al terminar
+        state = {'done': 0, 'count': 0, 'pending': set(futures), 'failed': []}
+        
+        def finish():
+            executor.shutdown(wait=False, cancel_futures=True)
+            if log_listener is not None:
+                # Escribir los registros pendientes de los trabajadores antes del resumen
+                log_listener.stop()
+            progress_dialog.destroy()
             if cancel_flag['cancel']:
-                break
-            # Reemplazar valores según configuración
-            if not self.use_excel_security.get() or not room_data.encryption:
-                room_data.encryption = self.security_var.get()
-            if not self.use_excel_property.get() or not room_data.property_type:
-                property_val = self.property_var.get()
-                room_data.property_type = None if property_val == "Sin Logo" else property_val
-            # Generar QR (usando nombre de habitación como prefijo de archivo)
-            room_name = room_data.ssid.replace(" ", "_")
-            if self._generate_and_show_qr(room_data, room_name):
-                count += 1
-            progress_var.set(f"{idx} / {len(all_rooms)}")
-            self.root.update()  # Cambiado de update_idletasks() a update() para permitir eventos
-        progress_dialog.destroy()
-        if cancel_flag['cancel']:
-            messagebox.showinfo("Cancelado", f"Operación cancelada. Se generaron {count} códigos QR antes de cancelar.")
-        elif count > 0:
-            messagebox.showinfo("Éxito", f"Se generaron {count} códigos QR")
-        else:
-            messagebox.showerror("Error", "No se pudo generar ningún código QR")
+                messagebox.showinfo("Cancelado", f"Operación cancelada. Se generaron {state['count']} códigos QR antes de cancelar.")
+            elif state['count'] > 0 and state['failed']:
+                failed = state['failed']
+                details = "\n".join(f"{room_data.room or '-'} ({room_data.ssid})" for room_data in failed[:20])
+                if len(failed) > 20:
+                    details += f"\n... y {len(failed) - 20} más"
+                messagebox.showwarning(
+                    "Generación incompleta",
+                    f"Se generaron {state['count']} códigos QR. Fallaron {len(failed)}:\n{details}\n\nConsulte el registro para más detalles."
+                )
+            elif state['count'] > 0:
+                messagebox.showinfo("Éxito", f"Se generaron {state['count']} códigos QR")
+            else:
+                messagebox.showerror("Error", "No se pudo generar ningún código QR")
+        
+        def poll_progress():
+            # Recoger resultados en orden de finalización sin bloquear el bucle de eventos de Tk
+            if cancel_flag['cancel']:
+                finish()
+                return
+            done, state['pending'] = wait(state['pending'], timeout=0)
+            for future in done:
+                state['done'] += 1
+                try:
+                    saved_path = future.result()
+                except Exception as e:
+                    # Por ejemplo, un proceso trabajador que terminó inesperadamente
+                    self.logger.error(f"Error en proceso de generación masiva: {str(e)}")
+                    saved_path = None
+                if saved_path:
+                    state['count'] += 1
+                    self.last_qr_path = saved_path
+                    self._last_qr_valid = True
+                else:
+                    state['failed'].append(futures[future])
+            progress_bar['value'] = state['done']
+            progress_var.set(f"{state['done']} / {total}")
+            if state['done'] < total:
+                self.root.after(50, poll_progress)
+            else:
+                finish()
+        
+        self.root.after(50, poll_progress)
+            
+    @staticmethod
+    def _batch_filenames(rooms: list) -> list:
+        """
+        Calcular una sola vez los nombres de archivo del lote.
+        
+        Credenciales distintas que producirían el mismo nombre (mismo SSID y propiedad)
+        se distinguen añadiendo la habitación, para que no se sobrescriban entre sí.
+        """
+        filenames = [QRManager.build_filename(room_data) for room_data in rooms]
+        name_counts = Counter(filenames)
+        return [
+            f"{os.path.splitext(filename)[0]}_{QRManager.sanitize_filename(room_data.room)}.png"
+            if name_counts[filename] > 1 and room_data.room else filename
+            for filename, room_data in zip(filenames, rooms)
+        ]
+        
+    def _create_batch_executor(self, workers: int, output_dir: str) -> tuple:
+        """
+        Crear el ejecutor de generación masiva: procesos si es posible, hilos como alternativa.
+        
+        Returns:
+            tuple: (ejecutor, receptor de registros de los procesos o None con hilos)
+        """
+        log_listener = None
+        try:
+            # Los trabajadores envían sus registros por una cola al archivo de esta sesión
+            log_queue, log_listener = LogManager.start_worker_listener()
+            # Cada proceso configura su registro y carga sus logos al arrancar (init_worker)
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(output_dir, log_queue, logging.getLogger().getEffectiveLevel())
+            )
+            return executor, log_listener
+        except (OSError, NotImplementedError, ValueError) as e:
+            if log_listener is not None:
+                log_listener.stop()
+            self.logger.warning(f"No se pudo crear el grupo de procesos, usando hilos: {str(e)}")
+            return ThreadPoolExecutor(max_workers=workers), None
+            
+    @staticmethod
+    def _open_with_system(path: str):
+        """
+        Abrir un archivo o carpeta con la aplicación predeterminada del sistema.
+        
+        En macOS y Linux el proceso se lanza en su propia sesión y no se espera a que
+        termine, para no bloquear el hilo de Tk.
+        """
+        # Usar el comando correcto según la plataforma
+        if os.name == 'nt':  # Windows
+            os.startfile(path)
+        elif os.name == 'posix':  # macOS, Linux
+            opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+            subprocess.Popen([opener, path], start_new_session=True,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             
     def _open_codes_folder(self):
         """Abrir carpeta donde se guardan los códigos QR generados."""
@@ -1107,29 +1501,24 @@ class MainWindow:
         if not os.path.exists(folder_path):
             os.makedirs(folder_path, exist_ok=True)
         
-        # Usar el comando correcto según la plataforma
         try:
-            if os.name == 'nt':  # Windows
-                os.startfile(folder_path)
-            elif os.name == 'posix':  # macOS, Linux
-                if sys.platform == 'darwin':  # macOS
-                    subprocess.run(['open', folder_path])
-                else:  # Linux
-                    subprocess.run(['xdg-open', folder_path])
+            self._open_with_system(folder_path)
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo abrir la carpeta: {str(e)}")
             
     def _open_last_qr(self):
         """Abrir el último código QR generado."""
-        if hasattr(self, 'last_qr_path') and os.path.exists(self.last_qr_path):
+        if self._last_qr_valid:
             try:
-                if os.name == 'nt':  # Windows
-                    os.startfile(self.last_qr_path)
-                elif os.name == 'posix':  # macOS, Linux
-                    if sys.platform == 'darwin':  # macOS
-                        subprocess.run(['open', self.last_qr_path])
-                    else:  # Linux
-                        subprocess.run(['xdg-open', self.last_qr_path])
+                self._open_with_system(self.last_qr_path)
+            except FileNotFoundError as e:
+                # os.startfile falla con la ruta del QR si se borró o movió después de generarlo;
+                # si falta el programa que abre archivos, e.filename es ese programa
+                if e.filename != self.last_qr_path:
+                    messagebox.showerror("Error", f"No se pudo abrir el archivo: {str(e)}")
+                    return
+                self._last_qr_valid = False
+                messagebox.showinfo("Información", "El último código QR generado ya no existe")
             except Exception as e:
                 messagebox.showerror("Error", f"No se pudo abrir el archivo: {str(e)}")
         else:
@@ -1137,13 +1526,40 @@ class MainWindow:
             
     def _update_recent_files_list(self):
         """Actualizar lista de archivos recientes en el combobox."""
+        # Reconstruir solo si la lista cambió desde la última vez
+        if self._recent_version == self.config_manager.recent_version:
+            return
         recent_files = self.config_manager.get_recent_files()
-        files = [f["path"] for f in recent_files]
-        self.file_combo['values'] = files
+        self._recent_version = self.config_manager.recent_version
+        
+        # Calcular cada nombre una sola vez; si dos archivos se llaman igual se muestra la ruta
+        labels = []
+        self._file_paths = {}
+        for f in recent_files:
+            label = os.path.basename(f["path"])
+            if label in self._file_paths:
+                label = f["path"]
+            labels.append(label)
+            self._file_paths[label] = f["path"]
+        self.file_combo['values'] = labels
+        
+    def _file_label(self, file_path: str) -> str:
+        """Texto del combobox para una ruta: su entrada en la lista reciente o el nombre del archivo."""
+        for label, path in self._file_paths.items():
+            if path == file_path:
+                return label
+        return os.path.basename(file_path)
+        
+    def _schedule_file_selected(self, event):
+        """Agrupar selecciones rápidas del combobox: solo se carga la última que se mantiene."""
+        if self._file_select_job is not None:
+            self.root.after_cancel(self._file_select_job)
+        self._file_select_job = self.root.after(self.FILE_SELECT_DEBOUNCE_MS, self._on_file_selected, event)
         
     def _on_file_selected(self, event):
         """Manejar selección de archivo en el combobox."""
-        filename = self.file_path.get()
+        self._file_select_job = None
+        filename = self._file_paths.get(self.file_combo.get())
         if filename:
             self._load_excel_file(filename)
             
@@ -1166,13 +1582,14 @@ class MainWindow:
             if hasattr(self.excel_manager.columns, 'property_type') and self.excel_manager.columns.property_type is not None:
                 initial_columns['property_type'] = self.excel_manager.columns.property_type
         
-        # Mostrar diálogo
-        dialog = ColumnSelectionDialog(self.root, initial_columns)
-        self.root.wait_window(dialog)
+        # Mostrar diálogo (se crea la primera vez y luego solo se muestra/oculta)
+        if self._col_dialog is None:
+            self._col_dialog = ColumnSelectionDialog(self.root)
+        column_indices = self._col_dialog.show(initial_columns)
         
         # Si se seleccionaron columnas, aplicarlas
-        if dialog.column_indices:
-            if self.excel_manager.set_columns_manually(dialog.column_indices):
+        if column_indices:
+            if self.excel_manager.set_columns_manually(column_indices):
                 self._enable_room_search()
                 # Guardar configuración después de asignar columnas manualmente
                 self._save_sheet_config()
@@ -1190,7 +1607,10 @@ class MainWindow:
         
     def _reset_excel_ui(self):
         """Resetear elementos de UI relacionados con Excel a su estado inicial."""
+        if self.excel_manager:
+            self.excel_manager.close()
         self.excel_manager = None
+        self._last_qr_valid = False
         self.sheet_combo['values'] = []
         self.sheet_combo.set("")
         self.sheet_combo['state'] = 'disabled'
@@ -1274,6 +1694,17 @@ class MainWindow:
                 self.auth_required_frame.pack(fill=tk.X, padx=5, pady=5)
                 self.logger.debug("Panel de opciones de Excel oculto")
                 
+    def _on_close(self):
+        """Cerrar la ventana liberando el hilo de guardado y el libro abierto."""
+        # Descartar lo que no haya empezado; un guardado en curso termina antes de salir
+        self._preview_executor.shutdown(wait=False, cancel_futures=True)
+        for job in (self._drain_job, self._file_select_job, self._room_qr_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        if self.excel_manager:
+            self.excel_manager.close()
+        self.root.destroy()
+        
     def run(self):
         """Iniciar la aplicación."""
         self.root.mainloop()
\ No newline at end of file
@@ -17,7 +17,8 @@ class ConfigManager:
     DEFAULT_CONFIG = {
         "recent_files": [],  # Lista de diccionarios {path: str, last_sheet: str}
         "max_recent_files": 5,  # Máximo número de archivos recientes a recordar
-        "sheet_configs": {}  # Configuraciones por hoja {file_path+sheet_name: config}
+        "sheet_configs": {},  # Configuraciones por hoja {file_path+sheet_name: config}
+        "last_dir": ""  # Última carpeta usada en el diálogo "Examinar"
     }
     
     def __init__(self, config_file: str = "config.json"):
@@ -29,6 +30,9 @@ class ConfigManager:
         """
         self.config_file = resource_path(config_file)
         
+        # Contador que aumenta cada vez que cambia la lista de archivos recientes
+        self.recent_version = 0
+        
         # Verificar y asegurar que el archivo de configuración exista con la estructura adecuada
         self._ensure_config_file()
         
@@ -157,6 +161,7 @@ class ConfigManager:
         
         # Mantener solo los últimos N archivos
         self.config["recent_files"] = self.config["recent_files"][:self.config["max_recent_files"]]
+        self.recent_version += 1
         
         # Guardar cambios
         self.save_config()
@@ -177,6 +182,7 @@ class ConfigManager:
         # Actualizar lista si se eliminaron archivos
         if len(valid_files) != len(self.config["recent_files"]):
             self.config["recent_files"] = valid_files
+            self.recent_version += 1
             self.save_config()
             
         return valid_files
@@ -197,6 +203,31 @@ class ConfigManager:
                 return f["last_sheet"]
         return None
         
+    def get_last_dir(self) -> str:
+        """
+        Obtener la última carpeta desde la que se abrió un archivo Excel.
+        
+        Returns:
+            str: Carpeta guardada si aún existe; si no, la carpeta del usuario
+        """
+        last_dir = self.config.get("last_dir")
+        if last_dir and os.path.isdir(last_dir):
+            return last_dir
+        return os.path.expanduser("~")
+        
+    def set_last_dir(self, directory: str):
+        """
+        Recordar la carpeta del último archivo Excel abierto.
+        
+        Args:
+            directory (str): Carpeta a recordar
+        """
+        directory = os.path.normpath(directory)
+        if self.config.get("last_dir") == directory:
+            return
+        self.config["last_dir"] = directory
+        self.save_config()
+        
     def _get_sheet_key(self, file_path: str, sheet_name: str) -> str:
         """
         Generar clave única para identificar una hoja específica.
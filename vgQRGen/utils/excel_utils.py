@@ -4,6 +4,11 @@ Módulo de utilidades para manejo de Excel.
 Proporciona funciones auxiliares para manipulación de datos de Excel.
 """
 
+from functools import lru_cache
+
+# Tabla de letras para convertir dígitos base 26 sin chr()/ord() por iteración
+_A2Z = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
 def excel_column_to_index(column_letter: str) -> int:
     """
     Convertir letra de columna de Excel a índice de columna basado en cero.
@@ -21,12 +26,25 @@ def excel_column_to_index(column_letter: str) -> int:
         'AA' -> 26
         'AB' -> 27
     """
+    # Normalizar antes de consultar la caché para mantener pequeño el espacio de claves
     column_letter = column_letter.upper().strip()
+    # Caso común (A-ZZ): búsqueda directa en la tabla precalculada
+    index = _FAST_COLUMN_INDEX.get(column_letter)
+    if index is not None:
+        return index
+    return _excel_column_to_index(column_letter)
+
+@lru_cache(maxsize=512)
+def _excel_column_to_index(column_letter: str) -> int:
+    """Conversión memorizada de una letra de columna ya normalizada."""
     result = 0
-    for i, char in enumerate(reversed(column_letter)):
-        result += (ord(char) - ord('A') + 1) * (26 ** i)
+    # Forma de Horner sobre los bytes ASCII: iterar bytes produce enteros directamente,
+    # sin ord() por carácter. Una letra no ASCII lanza UnicodeEncodeError (un ValueError)
+    for code in column_letter.encode('ascii'):
+        result = result * 26 + (code - 64)
     return result - 1
 
+@lru_cache(maxsize=512)
 def index_to_excel_column(index: int) -> str:
     """
     Convertir índice de columna basado en cero a letra de columna de Excel.
@@ -37,9 +55,16 @@ def index_to_excel_column(index: int) -> str:
     Returns:
         str: Letra de columna (por ejemplo, 'A', 'B', 'AA', etc.)
     """
+    # Caso más común en los diálogos: una sola letra
+    if 0 <= index < 26:
+        return _A2Z[index]
     index += 1
-    result = ""
+    letters = []
     while index > 0:
         index, remainder = divmod(index - 1, 26)
-        result = chr(ord('A') + remainder) + result
-    return result
\ No newline at end of file
+        letters.append(_A2Z[remainder])
+    # Los dígitos se generan del menos al más significativo
+    return "".join(reversed(letters))
+
+# Índices precalculados para columnas de una y dos letras (A-ZZ, 702 columnas)
+_FAST_COLUMN_INDEX = {index_to_excel_column.__wrapped__(i): i for i in range(702)}
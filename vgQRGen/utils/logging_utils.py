@@ -6,9 +6,11 @@ Este módulo proporciona una configuración centralizada de registro para la apl
 
 import os
 import logging
+import logging.handlers
 import datetime
 import sys
-from typing import Optional
+import multiprocessing
+from typing import Optional, Tuple
 from .path_utils import resource_path
 
 class LogManager:
@@ -97,7 +99,9 @@ class LogManager:
         Returns:
             logging.Logger: Instancia de registrador configurada
         """
-        if not cls._initialized:
+        # Un proceso trabajador (multiprocessing) no crea su propio archivo de registro al
+        # importar los módulos: su registro se configura con configure_worker
+        if not cls._initialized and not cls.is_worker_process():
             cls()
             
         logger_name = name if name else 'vgQrGen'
@@ -109,6 +113,61 @@ class LogManager:
         
         return logger
         
+    @staticmethod
+    def is_worker_process() -> bool:
+        """
+        Indicar si el código se ejecuta en un proceso hijo de multiprocessing.
+        
+        Con el método spawn (Windows) los módulos se importan al deserializar la tarea,
+        antes de que parent_process() esté disponible; el nombre del proceso, en cambio,
+        ya se ha asignado en ese momento.
+        """
+        return multiprocessing.current_process().name != 'MainProcess'
+        
+    @staticmethod
+    def start_worker_listener() -> Tuple["multiprocessing.Queue", logging.handlers.QueueListener]:
+        """
+        Crear la cola de registro para procesos trabajadores y su receptor en este proceso.
+        
+        Los registros que llegan por la cola se escriben con los manejadores actuales del
+        registrador raíz (consola y archivo de la sesión).
+        
+        Returns:
+            Tuple[multiprocessing.Queue, QueueListener]: Cola para configure_worker y receptor iniciado
+        """
+        log_queue = multiprocessing.Queue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *logging.getLogger().handlers, respect_handler_level=True
+        )
+        listener.start()
+        return log_queue, listener
+        
+    @staticmethod
+    def configure_worker(log_queue=None, level: int = logging.INFO):
+        """
+        Configurar el registro de un proceso trabajador.
+        
+        Sustituye los manejadores heredados: con cola, los registros se envían al proceso
+        principal; sin ella, solo se escriben en consola.
+        
+        Args:
+            log_queue: Cola creada con start_worker_listener, o None
+            level (int): Nivel mínimo de registro del trabajador
+        """
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            # Cerrar los manejadores heredados (por ejemplo, el archivo del proceso principal)
+            handler.close()
+            
+        if log_queue is not None:
+            handler = logging.handlers.QueueHandler(log_queue)
+        else:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        root.addHandler(handler)
+        root.setLevel(level)
+        
     @classmethod
     def flush(cls):
         """Forzar la escritura de todos los mensajes de registro pendientes al archivo."""
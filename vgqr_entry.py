@@ -7,6 +7,7 @@ Este archivo sirve como punto de entrada compatible con PyInstaller.
 import sys
 import os
 import argparse
+import multiprocessing
 
 def ensure_directories():
     """Garantiza que las carpetas necesarias para la aplicación existan."""
@@ -69,4 +70,6 @@ def main():
         LogManager.close()
 
 if __name__ == "__main__":
+    # Necesario para los procesos trabajadores de generación masiva en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     sys.exit(main())